@@ -2,7 +2,7 @@ import asyncio
 from typing import List, Tuple
 from astrbot.api import logger
 from astrbot.core.message.message_event_result import MessageChain
-from .command_trigger import CommandTrigger
+from .command_trigger import CommandTrigger, DEFAULT_MAX_CAPTURE
 
 
 class CommandExecutor:
@@ -21,7 +21,7 @@ class CommandExecutor:
     ) -> Tuple[bool, List[MessageChain]]:
         """执行指令并捕获响应"""
         try:
-            logger.info(f"开始执行指令: {command}")
+            logger.info("开始执行指令: %s", command)
 
             # 使用CommandTrigger来触发指令并捕获响应
             (
@@ -33,18 +33,15 @@ class CommandExecutor:
 
             if success:
                 logger.info(
-                    f"成功执行指令 {command}，捕获到 {len(captured_messages)} 条响应"
+                    "成功执行指令 %s，捕获到 %d 条响应", command, len(captured_messages)
                 )
                 return True, captured_messages
             else:
-                logger.warning(f"指令 {command} 执行失败，未捕获到响应")
+                logger.warning("指令 %s 执行失败，未捕获到响应", command)
                 return False, []
 
         except Exception as e:
-            logger.error(f"执行指令失败: {str(e)}")
-            import traceback
-
-            logger.error(traceback.format_exc())
+            logger.exception("执行指令失败: %s", e)
             return False, []
 
     async def execute_command_with_options(
@@ -55,11 +52,15 @@ class CommandExecutor:
         creator_name: str = None,
         capture_timeout: float = 20.0,
         wait_interval: float = 0.1,
+        max_capture: int = DEFAULT_MAX_CAPTURE,
     ) -> Tuple[bool, List[MessageChain]]:
-        """执行指令并捕获响应（可配置超时）"""
+        """执行指令并捕获响应（可配置超时与捕获上限）"""
         try:
             logger.info(
-                f"开始执行指令(可配置): {command}, capture_timeout={capture_timeout}, wait_interval={wait_interval}"
+                "开始执行指令(可配置): %s, capture_timeout=%s, wait_interval=%s",
+                command,
+                capture_timeout,
+                wait_interval,
             )
 
             (
@@ -72,21 +73,19 @@ class CommandExecutor:
                 creator_name,
                 max_wait_time=capture_timeout,
                 wait_interval=wait_interval,
+                max_capture=max_capture,
             )
 
             if success:
                 logger.info(
-                    f"成功执行指令 {command}，捕获到 {len(captured_messages)} 条响应"
+                    "成功执行指令 %s，捕获到 %d 条响应", command, len(captured_messages)
                 )
                 return True, captured_messages
 
-            logger.warning(f"指令 {command} 执行失败，未捕获到响应")
+            logger.warning("指令 %s 执行失败，未捕获到响应", command)
             return False, []
         except Exception as e:
-            logger.error(f"执行指令失败(可配置): {str(e)}")
-            import traceback
-
-            logger.error(traceback.format_exc())
+            logger.exception("执行指令失败(可配置): %s", e)
             return False, []
 
     async def execute_and_forward(
@@ -98,7 +97,7 @@ class CommandExecutor:
     ):
         """执行指令并转发结果"""
         try:
-            logger.info(f"开始执行并转发指令: {command}")
+            logger.info("开始执行并转发指令: %s", command)
 
             # 使用CommandTrigger来触发指令并转发结果
             await self.command_trigger.trigger_and_forward_command(
@@ -106,10 +105,7 @@ class CommandExecutor:
             )
 
         except Exception as e:
-            logger.error(f"执行并转发指令失败: {str(e)}")
-            import traceback
-
-            logger.error(traceback.format_exc())
+            logger.exception("执行并转发指令失败: %s", e)
 
     async def execute_and_forward_with_options(
         self,
@@ -124,7 +120,10 @@ class CommandExecutor:
         """执行指令并转发结果（可配置超时与间隔）"""
         try:
             logger.info(
-                f"开始执行并转发指令(可配置): {command}, capture_timeout={capture_timeout}, forward_interval={forward_interval}"
+                "开始执行并转发指令(可配置): %s, capture_timeout=%s, forward_interval=%s",
+                command,
+                capture_timeout,
+                forward_interval,
             )
 
             await self.command_trigger.trigger_and_forward_command(
@@ -137,7 +136,4 @@ class CommandExecutor:
                 forward_interval=forward_interval,
             )
         except Exception as e:
-            logger.error(f"执行并转发指令失败(可配置): {str(e)}")
-            import traceback
-
-            logger.error(traceback.format_exc())
+            logger.exception("执行并转发指令失败(可配置): %s", e)
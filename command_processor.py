@@ -1,11 +1,44 @@
 import asyncio
-from typing import List
+import time
+from collections import OrderedDict
+from typing import List, Tuple
 from astrbot.api.event import AstrMessageEvent
 from astrbot.api import logger
+from astrbot.api.message_components import Plain
+from astrbot.core.message.message_event_result import MessageChain
 from .data_manager import DataManager
 from .utils import CommandUtils
 from .command_executor import CommandExecutor
 
+# 唤醒前缀缓存有效期（秒）
+WAKE_PREFIX_CACHE_TTL = 30.0
+# 唤醒前缀缓存最多保留的会话数，超出时淘汰最久未使用的会话
+WAKE_PREFIX_CACHE_MAXSIZE = 256
+_WakePrefixEntry = Tuple[List[str], Tuple[str, ...], float]
+
+# 需要主动向会话转发捕获消息的响应模式
+_FORWARD_MODES = frozenset({"forward_and_text", "forward_only"})
+
+# list_mappings 的过滤参数别名及输出文案
+_ALIAS_MAP = {
+    "all": "all",
+    "--all": "all",
+    "enabled": "enabled",
+    "--enabled": "enabled",
+    "disabled": "disabled",
+    "--disabled": "disabled",
+}
+_EMPTY_TEXT = {
+    "all": "当前没有配置任何指令映射",
+    "enabled": "当前没有已启用的指令映射",
+    "disabled": "当前没有已禁用的指令映射",
+}
+_TITLE_MAP = {
+    "all": "当前配置的指令映射：",
+    "enabled": "当前已启用的指令映射：",
+    "disabled": "当前已禁用的指令映射：",
+}
+
 
 class CommandProcessor:
     def __init__(self, star_instance):
@@ -13,14 +46,45 @@ class CommandProcessor:
         self.context = star_instance.context
         self.data_manager = star_instance.data_manager
         self.command_executor = CommandExecutor(self.context)
-
-    def _resolve_wake_prefixes(self, event: AstrMessageEvent) -> List[str]:
-        """解析当前会话可用的主框架唤醒前缀列表。"""
+        # unified_msg_origin -> (唤醒前缀列表, 非空前缀元组, 缓存时间)，按最近使用排序
+        self._wake_prefix_cache: "OrderedDict[str, _WakePrefixEntry]" = OrderedDict()
+
+    def invalidate_wake_prefix_cache(self):
+        """清空唤醒前缀缓存，主框架配置变更后调用"""
+        self._wake_prefix_cache.clear()
+
+    def _resolve_wake_prefixes(
+        self, event: AstrMessageEvent
+    ) -> Tuple[List[str], Tuple[str, ...]]:
+        """解析当前会话可用的主框架唤醒前缀（按会话缓存）。
+
+        Returns:
+            (prefixes, nonempty_prefixes): 前缀列表，以及可直接传给 str.startswith 的非空前缀元组
+        """
+        umo = event.unified_msg_origin
+        cache = self._wake_prefix_cache
+        cached = cache.get(umo)
+        if cached:
+            if time.monotonic() - cached[2] < WAKE_PREFIX_CACHE_TTL:
+                cache.move_to_end(umo)
+                return cached[0], cached[1]
+            # 过期条目立即移除，避免失效数据常驻
+            del cache[umo]
+
+        normalized = self._load_wake_prefixes(umo)
+        nonempty = tuple(prefix for prefix in normalized if prefix)
+        cache[umo] = (normalized, nonempty, time.monotonic())
+        if len(cache) > WAKE_PREFIX_CACHE_MAXSIZE:
+            cache.popitem(last=False)
+        return normalized, nonempty
+
+    def _load_wake_prefixes(self, umo: str) -> List[str]:
+        """从主框架配置读取唤醒前缀列表。"""
         config = {}
 
         if hasattr(self.context, "get_config"):
             try:
-                config = self.context.get_config(umo=event.unified_msg_origin)
+                config = self.context.get_config(umo=umo)
             except TypeError:
                 config = self.context.get_config()
             except Exception:
@@ -45,6 +109,39 @@ class CommandProcessor:
         normalized = [prefix for prefix in prefixes if prefix is not None]
         return normalized or ["/"]
 
+    @staticmethod
+    def _extract_response_texts(captured_messages) -> List[str]:
+        """提取捕获消息中的纯文本，提取方式按首条消息的类型解析一次"""
+        messages = [
+            msg_chain for msg_chain in captured_messages if msg_chain is not None
+        ]
+        if not messages:
+            return []
+
+        chain_type = type(messages[0])
+        extractor = getattr(chain_type, "get_plain_text", None) or getattr(
+            chain_type, "to_plain_text", None
+        )
+
+        response_texts = []
+        for msg_chain in messages:
+            if extractor is not None and type(msg_chain) is chain_type:
+                text = extractor(msg_chain)
+            else:
+                # 手动提取文本
+                text_parts = []
+                for component in getattr(msg_chain, "chain", None) or ():
+                    part = getattr(component, "text", None) or getattr(
+                        component, "content", None
+                    )
+                    if part:
+                        text_parts.append(part)
+                text = "".join(text_parts)
+
+            if text:
+                response_texts.append(text)
+        return response_texts
+
     async def execute_command(self, event, command_text: str, args: str = "") -> str:
         """执行指令"""
         try:
@@ -52,19 +149,19 @@ class CommandProcessor:
                 return "插件当前已禁用，请在 WebUI 的 basic_config.enable_plugin 中开启后再试。"
 
             # 查找指令映射
-            mapping = self.data_manager.get_mapping(command_text)
+            mapping = self.data_manager.get_mapping_view(command_text)
             if not mapping:
                 return f"错误：未找到指令 '{command_text}' 的映射。请先使用 add_command_mapping 添加映射。"
 
             llm_function = mapping.get("llm_function")
             description = mapping.get("description", "")
 
-            logger.info(f"执行指令映射: {command_text} -> {llm_function}")
+            logger.info("执行指令映射: %s -> %s", command_text, llm_function)
 
             # 构建完整指令（自动匹配 AstrBot 主框架 wake_prefix）
-            wake_prefixes = self._resolve_wake_prefixes(event)
-            already_prefixed = any(
-                prefix and command_text.startswith(prefix) for prefix in wake_prefixes
+            wake_prefixes, nonempty_prefixes = self._resolve_wake_prefixes(event)
+            already_prefixed = bool(nonempty_prefixes) and command_text.startswith(
+                nonempty_prefixes
             )
             if already_prefixed:
                 full_command = command_text
@@ -72,24 +169,26 @@ class CommandProcessor:
                 full_command = f"{wake_prefixes[0]}{command_text}"
 
             logger.info(
-                f"执行指令前缀解析: wake_prefixes={wake_prefixes}, 使用命令={full_command}"
+                "执行指令前缀解析: wake_prefixes=%s, 使用命令=%s",
+                wake_prefixes,
+                full_command,
             )
 
             if args:
                 full_command += f" {args}"
 
             # 获取用户信息
-            creator_id = (
-                event.get_sender_id() if hasattr(event, "get_sender_id") else "user"
-            )
-            creator_name = None
-            if hasattr(event, "message_obj") and hasattr(event.message_obj, "sender"):
-                creator_name = event.message_obj.sender.nickname
-
-            capture_timeout = self.data_manager.get_capture_timeout()
-            wait_interval = min(0.5, max(0.05, capture_timeout / 200))
-            forward_interval = self.data_manager.get_forward_interval()
-            response_mode = self.data_manager.get_response_mode()
+            get_sender_id = getattr(event, "get_sender_id", None)
+            creator_id = get_sender_id() if get_sender_id else "user"
+            message_obj = getattr(event, "message_obj", None)
+            sender = getattr(message_obj, "sender", None) if message_obj else None
+            creator_name = getattr(sender, "nickname", None)
+
+            runtime_config = self.data_manager.get_runtime_config()
+            capture_timeout = runtime_config.capture_timeout
+            wait_interval = runtime_config.wait_interval
+            forward_interval = runtime_config.forward_interval
+            response_mode = runtime_config.response_mode
 
             # 使用指令执行器执行指令
             (
@@ -105,67 +204,43 @@ class CommandProcessor:
             )
 
             if success and captured_messages:
-                if response_mode in {"forward_and_text", "forward_only"}:
+                if response_mode in _FORWARD_MODES:
                     logger.info(
-                        f"[command_processor] 开始主动发送转发消息，mode={response_mode}"
+                        "[command_processor] 开始主动发送转发消息，mode=%s",
+                        response_mode,
                     )
 
+                    header = Plain(f"[指令执行] {command_text}\n")
+                    # 下一条消息最早可发送的时间：以上一次发送的开始时刻计，
+                    # send_message 自身的耗时计入间隔，只补足剩余部分
+                    send_deadline = time.monotonic()
                     for i, captured_msg in enumerate(captured_messages):
                         if captured_msg is not None:
                             logger.info(
-                                f"[command_processor] 发送第 {i + 1} 条转发消息"
-                            )
-
-                            # 构建转发消息
-                            from astrbot.core.message.message_event_result import (
-                                MessageChain,
+                                "[command_processor] 发送第 %s 条转发消息", i + 1
                             )
-                            from astrbot.api.message_components import Plain
 
-                            forward_msg = MessageChain()
-                            forward_msg.chain.append(
-                                Plain(f"[指令执行] {command_text}\n")
+                            # 构建转发消息：标题 + 捕获到的消息内容
+                            components = getattr(captured_msg, "chain", None)
+                            forward_msg = MessageChain(
+                                chain=[header, *components] if components else [header]
                             )
 
-                            # 添加捕获到的消息内容
-                            if hasattr(captured_msg, "chain") and captured_msg.chain:
-                                for component in captured_msg.chain:
-                                    forward_msg.chain.append(component)
-
                             # 发送转发消息
+                            now = time.monotonic()
+                            if now < send_deadline:
+                                await asyncio.sleep(send_deadline - now)
+                            started = time.monotonic()
                             await self.context.send_message(
                                 event.unified_msg_origin, forward_msg
                             )
-
-                            # 如果有多条消息，添加间隔
-                            if (
-                                len(captured_messages) > 1
-                                and i < len(captured_messages) - 1
-                            ):
-                                await asyncio.sleep(forward_interval)
+                            send_deadline = started + forward_interval
+                            if forward_interval <= 0:
+                                # 无转发间隔时主动让出事件循环，避免连续发送阻塞其他协程
+                                await asyncio.sleep(0)
 
                 # 提取响应文本用于返回给LLM函数
-                response_texts = []
-                for msg_chain in captured_messages:
-                    if msg_chain is not None:
-                        # 尝试不同的方法获取文本
-                        text = None
-                        if hasattr(msg_chain, "get_plain_text"):
-                            text = msg_chain.get_plain_text()
-                        elif hasattr(msg_chain, "to_plain_text"):
-                            text = msg_chain.to_plain_text()
-                        elif hasattr(msg_chain, "chain") and msg_chain.chain:
-                            # 手动提取文本
-                            text_parts = []
-                            for component in msg_chain.chain:
-                                if hasattr(component, "text"):
-                                    text_parts.append(component.text)
-                                elif hasattr(component, "content"):
-                                    text_parts.append(component.content)
-                            text = "".join(text_parts) if text_parts else None
-
-                        if text:
-                            response_texts.append(text)
+                response_texts = self._extract_response_texts(captured_messages)
 
                 if response_texts:
                     if response_mode == "forward_only":
@@ -179,7 +254,7 @@ class CommandProcessor:
                 return f"指令 '{command_text}' 执行失败或超时"
 
         except Exception as e:
-            logger.error(f"执行指令失败: {e}")
+            logger.exception("执行指令失败: %s", e)
             return f"执行指令时发生错误：{str(e)}"
 
     async def add_mapping(
@@ -187,7 +262,10 @@ class CommandProcessor:
     ):
         """添加指令映射"""
         logger.info(
-            f"[command_processor] add_mapping 被调用 - 指令: '{command_name}', 函数: '{llm_function}', 描述: '{description}'"
+            "[command_processor] add_mapping 被调用 - 指令: '%s', 函数: '%s', 描述: '%s'",
+            command_name,
+            llm_function,
+            description,
         )
 
         try:
@@ -201,22 +279,21 @@ class CommandProcessor:
                 command_name, llm_function, description
             )
             logger.info(
-                f"[command_processor] data_manager.add_mapping 返回: success={success}, message='{message}'"
+                "[command_processor] data_manager.add_mapping 返回: success=%s, message='%s'",
+                success,
+                message,
             )
 
             if success and self.data_manager.should_auto_refresh_on_change():
-                logger.info(f"[command_processor] 开始刷新动态LLM函数")
+                logger.info("[command_processor] 开始刷新动态LLM函数")
                 # 刷新动态LLM函数
                 self.star.dynamic_llm_manager.refresh_functions()
-                logger.info(f"[command_processor] 动态LLM函数刷新完成")
+                logger.info("[command_processor] 动态LLM函数刷新完成")
 
             yield event.plain_result(message)
 
         except Exception as e:
-            logger.error(f"[command_processor] 添加指令映射失败: {e}")
-            import traceback
-
-            logger.error(f"[command_processor] 错误堆栈:\n{traceback.format_exc()}")
+            logger.exception("[command_processor] 添加指令映射失败: %s", e)
             yield event.plain_result(f"添加指令映射时发生错误：{str(e)}")
 
     async def list_mappings(self, event, state_filter: str = "all"):
@@ -228,52 +305,33 @@ class CommandProcessor:
                 )
                 return
 
-            normalized_filter = state_filter.strip().lower() if state_filter else "all"
-            alias_map = {
-                "all": "all",
-                "--all": "all",
-                "enabled": "enabled",
-                "--enabled": "enabled",
-                "disabled": "disabled",
-                "--disabled": "disabled",
-            }
-            if normalized_filter not in alias_map:
+            normalized_filter = _ALIAS_MAP.get((state_filter or "all").strip().lower())
+            if normalized_filter is None:
                 yield event.plain_result(
                     "过滤参数无效，可用值：--enabled / --disabled / --all"
                 )
                 return
-            normalized_filter = alias_map[normalized_filter]
 
             mappings = self.data_manager.list_mappings(state_filter=normalized_filter)
             if not mappings:
-                empty_text = {
-                    "all": "当前没有配置任何指令映射",
-                    "enabled": "当前没有已启用的指令映射",
-                    "disabled": "当前没有已禁用的指令映射",
-                }
-                yield event.plain_result(empty_text[normalized_filter])
+                yield event.plain_result(_EMPTY_TEXT[normalized_filter])
                 return
 
-            title_map = {
-                "all": "当前配置的指令映射：",
-                "enabled": "当前已启用的指令映射：",
-                "disabled": "当前已禁用的指令映射：",
-            }
-            result = title_map[normalized_filter] + "\n"
+            parts = [_TITLE_MAP[normalized_filter]]
             for i, (cmd, mapping) in enumerate(mappings.items(), 1):
                 llm_func = mapping.get("llm_function", "")
                 desc = mapping.get("description", "")
                 enabled = mapping.get("enabled", True)
-                result += f"{i}. {cmd} -> {llm_func}"
+                line = f"{i}. {cmd} -> {llm_func}"
                 if desc:
-                    result += f" ({desc})"
+                    line += f" ({desc})"
                 if not enabled:
-                    result += " [已禁用]"
-                result += "\n"
+                    line += " [已禁用]"
+                parts.append(line)
 
-            yield event.plain_result(result)
+            yield event.plain_result("\n".join(parts) + "\n")
         except Exception as e:
-            logger.error(f"列出指令映射失败: {e}")
+            logger.error("列出指令映射失败: %s", e)
             yield event.plain_result(f"列出指令映射时发生错误：{str(e)}")
 
     async def remove_mapping(self, event, command_name: str):
@@ -294,7 +352,7 @@ class CommandProcessor:
             else:
                 yield event.plain_result(f"错误：指令 '{command_name}' 不存在映射")
         except Exception as e:
-            logger.error(f"删除指令映射失败: {e}")
+            logger.error("删除指令映射失败: %s", e)
             yield event.plain_result(f"删除指令映射时发生错误：{str(e)}")
 
     async def set_mapping_enabled(self, event, command_name: str, enabled: bool):
@@ -315,5 +373,5 @@ class CommandProcessor:
             yield event.plain_result(message)
         except Exception as e:
             action = "启用" if enabled else "禁用"
-            logger.error(f"{action}指令映射失败: {e}")
+            logger.error("%s指令映射失败: %s", action, e)
             yield event.plain_result(f"{action}指令映射时发生错误：{str(e)}")
@@ -1,56 +1,136 @@
 import asyncio
+import time
+from typing import Optional
 from astrbot.api import logger
 from astrbot.api.message_components import Plain
 from astrbot.core.platform.astr_message_event import AstrMessageEvent
 from astrbot.core.message.message_event_result import MessageChain
 from .event_factory import EventFactory
 
+# 单次指令最多捕获的响应消息数，防止异常插件刷屏导致内存膨胀
+DEFAULT_MAX_CAPTURE = 64
+
+
+class _CaptureCtx:
+    """单次指令触发的捕获上下文，使多条指令可以并发共享同一个触发器"""
+
+    __slots__ = (
+        "messages",
+        "first_event",
+        "done",
+        "original_send",
+        "target",
+        "forward_umo",
+        "forward_interval",
+        "forward_lock",
+        "last_forward_at",
+        "forward_tasks",
+        "max_capture",
+        "dropped",
+    )
+
+    def __init__(
+        self,
+        target_event,
+        forward_umo: Optional[str] = None,
+        forward_interval: float = 0.5,
+        max_capture: int = DEFAULT_MAX_CAPTURE,
+    ):
+        self.messages = []  # 存储捕获到的消息
+        self.first_event = asyncio.Event()  # 首条响应到达信号
+        self.done = asyncio.Event()  # 事件流水线执行完毕信号
+        self.original_send = target_event.send  # 保存原始的send方法
+        self.target = target_event  # 目标事件对象
+        self.forward_umo = forward_umo  # 边捕获边转发的目标会话，None 表示不转发
+        self.forward_interval = max(forward_interval, 0.0)  # 转发间隔
+        self.forward_lock = asyncio.Lock()  # 保证转发顺序与间隔
+        self.last_forward_at = None  # 上一条转发开始发送的时间（monotonic）
+        self.forward_tasks = []  # 进行中的转发任务
+        self.max_capture = max(max_capture, 1)  # 捕获消息数上限
+        self.dropped = 0  # 超出上限被丢弃的消息数
+
 
 class CommandTrigger:
     """指令触发器，用于触发其他插件指令并捕获结果"""
 
     def __init__(self, context):
         self.context = context
-        self.captured_messages = []  # 存储捕获到的消息
-        self.original_send_method = None  # 保存原始的send方法
-        self.target_event = None  # 目标事件对象
         self.event_factory = EventFactory(context)  # 事件工厂
 
-    def setup_message_interceptor(self, target_event):
-        """设置消息拦截器来捕获指令的响应"""
-        self.target_event = target_event
-        self.captured_messages = []
+    def setup_message_interceptor(
+        self,
+        target_event,
+        forward_umo: Optional[str] = None,
+        forward_interval: float = 0.5,
+        max_capture: int = DEFAULT_MAX_CAPTURE,
+    ) -> _CaptureCtx:
+        """设置消息拦截器来捕获指令的响应
 
-        # 保存原始的send方法
-        if self.original_send_method is None:
-            self.original_send_method = target_event.send
+        Args:
+            forward_umo: 若提供，捕获到的消息会立即按 forward_interval 转发到该会话
+            max_capture: 最多捕获的消息数，超出部分直接丢弃
+        """
+        ctx = _CaptureCtx(target_event, forward_umo, forward_interval, max_capture)
 
         # 创建拦截器包装函数
         async def intercepted_send(message_chain):
-            # 捕获这条消息
-            if message_chain is not None and hasattr(message_chain, "chain"):
-                logger.info(
-                    f"捕获到指令响应消息，包含 {len(message_chain.chain)} 个组件"
-                )
-                self.captured_messages.append(message_chain)
-            else:
-                logger.info(f"捕获到指令响应消息，但消息为空或格式不正确")
-                # 即使消息为空，也记录为已捕获
-                if message_chain is not None:
-                    self.captured_messages.append(message_chain)
-
             # 设置已发送标记，但不实际发送到平台
             target_event._has_send_oper = True
+
+            if message_chain is None:
+                # 主框架在流水线执行完毕时会以 send(None) 收尾（如 WebChat），
+                # 此时所有响应都已发出，无需继续等待
+                ctx.done.set()
+                return True
+
+            if not getattr(message_chain, "chain", None):
+                logger.info("捕获到指令响应消息，但消息为空或格式不正确，已忽略")
+                return True
+
+            if len(ctx.messages) >= ctx.max_capture:
+                ctx.dropped += 1
+                return True
+
+            # 捕获这条消息
+            logger.info("捕获到指令响应消息，包含 %d 个组件", len(message_chain.chain))
+            ctx.messages.append(message_chain)
+            ctx.first_event.set()
+
+            if ctx.forward_umo:
+                ctx.forward_tasks.append(
+                    asyncio.create_task(self._forward_captured(ctx, message_chain))
+                )
             return True
 
         # 替换事件的send方法
         target_event.send = intercepted_send
-        logger.info(f"已设置消息拦截器，监听事件: {target_event.unified_msg_origin}")
+        logger.info("已设置消息拦截器，监听事件: %s", target_event.unified_msg_origin)
+        return ctx
+
+    async def _forward_captured(self, ctx: _CaptureCtx, message_chain):
+        """将捕获到的消息立即转发到会话，相邻两条之间至少间隔 forward_interval"""
+        async with ctx.forward_lock:
+            if ctx.last_forward_at is not None:
+                remaining = ctx.forward_interval - (
+                    time.monotonic() - ctx.last_forward_at
+                )
+                if remaining > 0:
+                    await asyncio.sleep(remaining)
+
+            # 以发送开始时刻计间隔，send_message 自身耗时不再额外叠加
+            ctx.last_forward_at = time.monotonic()
+            try:
+                await self.context.send_message(ctx.forward_umo, message_chain)
+            except Exception as e:
+                logger.error("转发捕获到的消息失败: %s", e)
+            if ctx.forward_interval <= 0:
+                # 无转发间隔时主动让出事件循环，避免连续发送阻塞其他协程
+                await asyncio.sleep(0)
 
-    def restore_message_sender(self):
+    def restore_message_sender(self, ctx: _CaptureCtx):
         """恢复原始的消息发送器"""
-        if self.original_send_method and self.target_event:
-            self.target_event.send = self.original_send_method
+        if ctx is not None and ctx.original_send:
+            ctx.target.send = ctx.original_send
             logger.info("已恢复原始消息发送器")
 
     def create_command_event(
@@ -73,10 +153,20 @@ class CommandTrigger:
         creator_name: str = None,
         max_wait_time: float = 20.0,
         wait_interval: float = 0.1,
+        forward_umo: Optional[str] = None,
+        forward_interval: float = 0.5,
+        max_capture: int = DEFAULT_MAX_CAPTURE,
     ):
-        """触发指令并捕获响应"""
+        """触发指令并捕获响应
+
+        Args:
+            forward_umo: 若提供，响应在捕获的同时被转发到该会话，无需等待捕获结束
+            forward_interval: 边捕获边转发时相邻消息的间隔
+            max_capture: 最多捕获的响应消息数
+        """
+        ctx = None
         try:
-            logger.info(f"开始触发指令: {command}")
+            logger.info("开始触发指令: %s", command)
 
             # 创建指令事件
             fake_event = self.create_command_event(
@@ -84,48 +174,76 @@ class CommandTrigger:
             )
 
             # 设置消息拦截器
-            self.setup_message_interceptor(fake_event)
+            ctx = self.setup_message_interceptor(
+                fake_event, forward_umo, forward_interval, max_capture
+            )
 
             # 提交事件到事件队列
             event_queue = self.context.get_event_queue()
             event_queue.put_nowait(fake_event)
 
-            logger.info(f"已将指令事件 {command} 提交到事件队列")
+            logger.info("已将指令事件 %s 提交到事件队列", command)
 
             # 等待指令执行并捕获响应
             max_wait_time = max(max_wait_time, 1.0)
             wait_interval = max(wait_interval, 0.05)
-            waited_time = 0.0
 
-            while waited_time < max_wait_time:
-                await asyncio.sleep(wait_interval)
-                waited_time += wait_interval
+            # 首条响应到达或流水线执行完毕，任一先发生即停止等待
+            first_wait = asyncio.ensure_future(ctx.first_event.wait())
+            done_wait = asyncio.ensure_future(ctx.done.wait())
+            try:
+                await asyncio.wait(
+                    {first_wait, done_wait},
+                    timeout=max_wait_time,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+            finally:
+                first_wait.cancel()
+                done_wait.cancel()
 
-                # 检查是否捕获到了消息
-                if self.captured_messages:
-                    logger.info(f"成功捕获到 {len(self.captured_messages)} 条响应消息")
-                    break
+            if ctx.messages:
+                if not ctx.done.is_set():
+                    # 首条响应到达后短暂等待，收集同一指令的多条响应
+                    try:
+                        await asyncio.wait_for(ctx.done.wait(), timeout=wait_interval)
+                    except asyncio.TimeoutError:
+                        pass
+                logger.info("成功捕获到 %d 条响应消息", len(ctx.messages))
 
-            # 恢复原始消息发送器
-            self.restore_message_sender()
+        except Exception as e:
+            logger.exception("触发指令失败: %s", e)
+            return False, []
 
-            if self.captured_messages:
-                return True, self.captured_messages
-            else:
-                logger.warning(
-                    f"等待 {max_wait_time} 秒后未捕获到指令 {command} 的响应消息"
+        finally:
+            # 确保恢复原始消息发送器
+            self.restore_message_sender(ctx)
+            # 无论成功或异常都等待已发起的转发完成，避免任务被遗弃或异常无人处理
+            if ctx is not None and ctx.forward_tasks:
+                results = await asyncio.gather(
+                    *ctx.forward_tasks, return_exceptions=True
                 )
-                return False, []
-
-        except Exception as e:
-            logger.error(f"触发指令失败: {str(e)}")
-            import traceback
+                for result in results:
+                    if isinstance(result, Exception):
+                        logger.error("转发任务异常结束: %s", result)
 
-            logger.error(traceback.format_exc())
+        if ctx.dropped:
+            logger.warning(
+                "指令 %s 的响应超过 %d 条上限，已丢弃 %d 条",
+                command,
+                ctx.max_capture,
+                ctx.dropped,
+            )
 
-            # 确保恢复原始消息发送器
-            self.restore_message_sender()
-            return False, []
+        if ctx.messages:
+            return True, ctx.messages
+        if ctx.done.is_set():
+            # 管线已提前结束，并非等满 max_wait_time 超时
+            logger.warning("指令 %s 的处理流程已结束，但未产生响应消息", command)
+        else:
+            logger.warning(
+                "等待 %s 秒后未捕获到指令 %s 的响应消息", max_wait_time, command
+            )
+        return False, []
 
     async def trigger_and_forward_command(
         self,
@@ -137,8 +255,7 @@ class CommandTrigger:
         wait_interval: float = 0.1,
         forward_interval: float = 0.5,
     ):
-        """触发指令并转发结果"""
-        # 触发指令并捕获响应
+        """触发指令并转发结果（响应到达即转发）"""
         success, captured_messages = await self.trigger_and_capture_command(
             unified_msg_origin,
             command,
@@ -146,27 +263,14 @@ class CommandTrigger:
             creator_name,
             max_wait_time,
             wait_interval,
+            forward_umo=unified_msg_origin,
+            forward_interval=forward_interval,
         )
 
         if success and captured_messages:
-            logger.info(
-                f"成功捕获到指令 {command} 的 {len(captured_messages)} 条响应，开始转发"
-            )
-
-            # 转发捕获到的消息
-            for i, captured_msg in enumerate(captured_messages):
-                logger.info(
-                    f"转发第 {i + 1} 条消息，包含 {len(captured_msg.chain)} 个组件"
-                )
-
-                # 发送捕获到的消息
-                await self.context.send_message(unified_msg_origin, captured_msg)
-
-                # 如果有多条消息，添加间隔
-                if len(captured_messages) > 1 and i < len(captured_messages) - 1:
-                    await asyncio.sleep(max(forward_interval, 0.0))
+            logger.info("已转发指令 %s 的 %d 条响应", command, len(captured_messages))
         else:
-            logger.warning(f"未能捕获到指令 {command} 的响应")
+            logger.warning("未能捕获到指令 %s 的响应", command)
 
             # 发送执行失败的提示
             error_msg = MessageChain()
@@ -1,16 +1,49 @@
 import os
+import sys
 import json
 import datetime
-from typing import Any, Dict, List, Tuple
+from contextlib import contextmanager
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, List, Mapping, NamedTuple, Optional, Tuple
 from astrbot.api.star import Context, StarTools
 from astrbot.api import logger
 from .utils import CommandUtils
 
+try:
+    import orjson
+except ImportError:  # 可选依赖，未安装时回退到标准库 json
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # 可选依赖，未安装时整体解析旧版文件
+    ijson = None
+
+
+# 合法的结果返回模式
+_VALID_RESPONSE_MODES = frozenset({"forward_and_text", "text_only", "forward_only"})
+
+# 未找到映射时返回的共享只读空映射
+_EMPTY_MAPPING: Mapping[str, Any] = MappingProxyType({})
+
+
+class RuntimeConfig(NamedTuple):
+    """执行指令时所需的运行参数快照"""
+
+    capture_timeout: float
+    wait_interval: float
+    forward_interval: float
+    response_mode: str
+
 
 class DataManager:
     def __init__(self, context: Context, config):
         self.context = context
         self.config = config
+        self._runtime_config: Optional[RuntimeConfig] = None
+        # bulk_edit 嵌套层数及期间是否有被推迟的保存
+        self._save_suspended = 0
+        self._pending_save = False
 
         # 旧版 JSON 存储路径（用于自动迁移）
         plugin_data_dir = StarTools.get_data_dir("command_to_llm")
@@ -27,7 +60,7 @@ class DataManager:
             if hasattr(self.config, "save_config"):
                 self.config.save_config()
         except Exception as e:
-            logger.error(f"保存插件配置失败: {e}")
+            logger.error("保存插件配置失败: %s", e)
 
     def _get_section(
         self, section_name: str, default_value: Dict[str, Any]
@@ -38,10 +71,18 @@ class DataManager:
 
         new_section = default_value.copy()
         self.config[section_name] = new_section
+        self._config_mutated = True
         return new_section
 
+    def _setdefault_tracking(self, section: Dict[str, Any], key: str, value: Any):
+        """同 dict.setdefault，键缺失时标记配置已变更"""
+        if key not in section:
+            section[key] = value
+            self._config_mutated = True
+
     def _ensure_config_defaults(self):
-        """确保配置结构完整，兼容旧版本与手动编辑场景"""
+        """确保配置结构完整，兼容旧版本与手动编辑场景（仅在补全了内容时保存）"""
+        self._config_mutated = False
         basic_config = self._get_section(
             "basic_config",
             {
@@ -50,9 +91,9 @@ class DataManager:
                 "strict_validation": False,
             },
         )
-        basic_config.setdefault("enable_plugin", True)
-        basic_config.setdefault("auto_refresh_on_change", True)
-        basic_config.setdefault("strict_validation", False)
+        self._setdefault_tracking(basic_config, "enable_plugin", True)
+        self._setdefault_tracking(basic_config, "auto_refresh_on_change", True)
+        self._setdefault_tracking(basic_config, "strict_validation", False)
 
         mapping_config = self._get_section(
             "mapping_config",
@@ -63,7 +104,8 @@ class DataManager:
         )
         if not isinstance(mapping_config.get("command_mappings"), list):
             mapping_config["command_mappings"] = []
-        mapping_config.setdefault("allow_duplicate_llm_function", True)
+            self._config_mutated = True
+        self._setdefault_tracking(mapping_config, "allow_duplicate_llm_function", True)
 
         execution_config = self._get_section(
             "execution_config",
@@ -73,9 +115,9 @@ class DataManager:
                 "response_mode": "forward_only",
             },
         )
-        execution_config.setdefault("capture_timeout_sec", 20)
-        execution_config.setdefault("forward_interval_sec", 0.5)
-        execution_config.setdefault("response_mode", "forward_only")
+        self._setdefault_tracking(execution_config, "capture_timeout_sec", 20)
+        self._setdefault_tracking(execution_config, "forward_interval_sec", 0.5)
+        self._setdefault_tracking(execution_config, "response_mode", "forward_only")
 
         compat_config = self._get_section(
             "compat_config",
@@ -85,9 +127,9 @@ class DataManager:
                 "migration_once_flag": False,
             },
         )
-        compat_config.setdefault("auto_migrate_legacy_json", True)
-        compat_config.setdefault("keep_legacy_backup", True)
-        compat_config.setdefault("migration_once_flag", False)
+        self._setdefault_tracking(compat_config, "auto_migrate_legacy_json", True)
+        self._setdefault_tracking(compat_config, "keep_legacy_backup", True)
+        self._setdefault_tracking(compat_config, "migration_once_flag", False)
 
         tool_config = self._get_section(
             "tool_config",
@@ -96,118 +138,198 @@ class DataManager:
                 "arg_description": "指令参数字符串。推荐 key=value 格式，多参数用空格分隔。例如：text=喝水 time=10:00。",
             },
         )
-        tool_config.setdefault(
-            "tool_description", "将已有指令映射为可调用函数，让 AI 能触发插件命令。"
+        self._setdefault_tracking(
+            tool_config,
+            "tool_description",
+            "将已有指令映射为可调用函数，让 AI 能触发插件命令。",
         )
-        tool_config.setdefault(
+        self._setdefault_tracking(
+            tool_config,
             "arg_description",
             "指令参数字符串。推荐 key=value 格式，多参数用空格分隔。例如：text=喝水 time=10:00。",
         )
 
-        self.config["basic_config"] = basic_config
-        self.config["mapping_config"] = mapping_config
-        self.config["execution_config"] = execution_config
-        self.config["tool_config"] = tool_config
-        self.config["compat_config"] = compat_config
-        self._save_config()
+        self._invalidate_cache()
+        if self._config_mutated:
+            self._save_config()
+
+    def _invalidate_cache(self):
+        """重新绑定缓存的配置分区，并丢弃运行参数快照"""
+        self._basic_config: Dict[str, Any] = self.config["basic_config"]
+        self._mapping_config: Dict[str, Any] = self.config["mapping_config"]
+        self._execution_config: Dict[str, Any] = self.config["execution_config"]
+        self._tool_config: Dict[str, Any] = self.config["tool_config"]
+        self._compat_config: Dict[str, Any] = self.config["compat_config"]
+        self._runtime_config = None
 
     def _normalize_mapping_entries(
         self, entries: List[Dict[str, Any]]
     ) -> Dict[str, Dict[str, Any]]:
+        # 循环内频繁使用的内建函数绑定为局部变量
+        _str = str
+        _bool = bool
+        _isinstance = isinstance
+        _dict = dict
+        _list = list
+        _intern = sys.intern
+
         normalized: Dict[str, Dict[str, Any]] = {}
         for item in entries:
-            if not isinstance(item, dict):
+            if not _isinstance(item, _dict):
                 continue
-            command_name = str(item.get("command_name", "")).strip()
-            llm_function = str(item.get("llm_function", "")).strip()
+            get = item.get
+            command_name = _intern(_str(get("command_name", "")).strip())
+            llm_function = _intern(_str(get("llm_function", "")).strip())
             if not command_name or not llm_function:
                 continue
 
-            aliases = item.get("aliases", [])
-            if not isinstance(aliases, list):
+            aliases = get("aliases", [])
+            if not _isinstance(aliases, _list):
                 aliases = []
+            stripped_aliases = [_str(alias).strip() for alias in aliases]
 
             normalized[command_name] = {
                 "llm_function": llm_function,
-                "description": str(item.get("description", "")).strip(),
-                "arg_description": str(item.get("arg_description", "")).strip(),
-                "enabled": bool(item.get("enabled", True)),
-                "group": str(item.get("group", "default")).strip() or "default",
-                "aliases": [
-                    str(alias).strip() for alias in aliases if str(alias).strip()
-                ],
-                "created_at": str(item.get("created_at", "")).strip(),
+                "description": _str(get("description", "")).strip(),
+                "arg_description": _str(get("arg_description", "")).strip(),
+                "enabled": _bool(get("enabled", True)),
+                "group": _str(get("group", "default")).strip() or "default",
+                "aliases": [alias for alias in stripped_aliases if alias],
+                "created_at": _str(get("created_at", "")).strip(),
             }
         return normalized
 
-    def _serialize_mappings(self) -> List[Dict[str, Any]]:
-        serialized: List[Dict[str, Any]] = []
+    @staticmethod
+    def _serialize_mapping(
+        command_name: str, mapping: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        return {
+            "__template_key": "mapping_item",
+            "enabled": bool(mapping.get("enabled", True)),
+            "command_name": command_name,
+            "llm_function": str(mapping.get("llm_function", "")),
+            "description": str(mapping.get("description", "")),
+            "arg_description": str(mapping.get("arg_description", "")),
+            "group": str(mapping.get("group", "default")) or "default",
+            "aliases": list(mapping.get("aliases", [])),
+            "created_at": str(mapping.get("created_at", "")),
+        }
+
+    def _rebuild_indexes(self):
+        """根据 command_mappings 全量重建序列化列表及其索引"""
+        self._mappings_view: Mapping[str, Dict[str, Any]] = MappingProxyType(
+            self.command_mappings
+        )
+        self._serialized: List[Dict[str, Any]] = [
+            self._serialize_mapping(command_name, mapping)
+            for command_name, mapping in self.command_mappings.items()
+        ]
+        self._serialized_index: Dict[str, int] = {
+            command_name: i for i, command_name in enumerate(self.command_mappings)
+        }
+        # llm_function -> 使用该函数名的（首个）指令，用于重复函数名校验
+        self._llm_function_index: Dict[str, str] = {}
         for command_name, mapping in self.command_mappings.items():
-            serialized.append(
-                {
-                    "__template_key": "mapping_item",
-                    "enabled": bool(mapping.get("enabled", True)),
-                    "command_name": command_name,
-                    "llm_function": str(mapping.get("llm_function", "")),
-                    "description": str(mapping.get("description", "")),
-                    "arg_description": str(mapping.get("arg_description", "")),
-                    "group": str(mapping.get("group", "default")) or "default",
-                    "aliases": list(mapping.get("aliases", [])),
-                    "created_at": str(mapping.get("created_at", "")),
-                }
-            )
-        return serialized
+            self._llm_function_index.setdefault(mapping["llm_function"], command_name)
+        self._rebuild_state_indexes()
+
+    def _rebuild_state_indexes(self):
+        """按配置顺序重建启用/禁用指令索引"""
+        # 以 dict 作有序集合，保持与 command_mappings 一致的顺序
+        self._enabled_commands: Dict[str, None] = {}
+        self._disabled_commands: Dict[str, None] = {}
+        for command_name, mapping in self.command_mappings.items():
+            if mapping["enabled"]:
+                self._enabled_commands[command_name] = None
+            else:
+                self._disabled_commands[command_name] = None
 
     def _save_mappings_to_config(self):
-        mapping_config = self._get_section("mapping_config", {"command_mappings": []})
-        mapping_config["command_mappings"] = self._serialize_mappings()
-        self.config["mapping_config"] = mapping_config
+        self._mapping_config["command_mappings"] = self._serialized
+        self._runtime_config = None
+        if self._save_suspended:
+            self._pending_save = True
+            return
+        self._pending_save = False
         self._save_config()
 
+    @contextmanager
+    def bulk_edit(self):
+        """批量修改映射期间推迟写盘，退出时至多保存一次
+
+        用法::
+
+            with data_manager.bulk_edit():
+                for command_name, llm_function in items:
+                    data_manager.add_mapping(command_name, llm_function)
+        """
+        self._save_suspended += 1
+        try:
+            yield self
+        finally:
+            self._save_suspended -= 1
+            if not self._save_suspended and self._pending_save:
+                self._save_mappings_to_config()
+
     def reload_from_config(self):
-        """从配置重新加载指令映射到内存缓存"""
+        """从配置重新加载指令映射到内存缓存
+
+        内存缓存即为权威数据，读写接口不再自动重新加载；
+        配置被外部修改后请显式调用（/cmd2llm refresh）。
+        """
         self._ensure_config_defaults()
-        mapping_config = self._get_section("mapping_config", {"command_mappings": []})
-        raw_entries = mapping_config.get("command_mappings", [])
+        raw_entries = self._mapping_config.get("command_mappings", [])
         if not isinstance(raw_entries, list):
             raw_entries = []
         self.command_mappings = self._normalize_mapping_entries(raw_entries)
+        self._rebuild_indexes()
 
-    def _load_legacy_mappings(self) -> Dict[str, Dict[str, Any]]:
-        if not os.path.exists(self.legacy_data_file):
-            return {}
+    @staticmethod
+    def _iter_legacy_entries(f):
+        """逐条产出旧版映射文件中的 (command_name, mapping)
 
-        try:
-            with open(self.legacy_data_file, "r", encoding="utf-8") as f:
-                legacy_data = json.load(f)
-        except Exception as e:
-            logger.error(f"读取旧版指令映射失败: {e}")
-            return {}
+        安装了 ijson 时流式解析，避免一次性构建整个文档对象。
+        """
+        if ijson is not None:
+            yield from ijson.kvitems(f, "")
+            return
 
-        if not isinstance(legacy_data, dict):
-            return {}
+        data = f.read()
+        legacy_data = orjson.loads(data) if orjson is not None else json.loads(data)
+        if isinstance(legacy_data, dict):
+            yield from legacy_data.items()
 
+    def _load_legacy_mappings(self) -> Dict[str, Dict[str, Any]]:
         migrated: Dict[str, Dict[str, Any]] = {}
-        for command_name, mapping in legacy_data.items():
-            if not isinstance(mapping, dict):
-                continue
-            llm_function = str(mapping.get("llm_function", "")).strip()
-            if not llm_function:
-                continue
-            migrated[str(command_name).strip()] = {
-                "llm_function": llm_function,
-                "description": str(mapping.get("description", "")).strip(),
-                "arg_description": "",
-                "enabled": True,
-                "group": "legacy",
-                "aliases": [],
-                "created_at": str(mapping.get("created_at", "")).strip()
-                or str(datetime.datetime.now()),
-            }
+        migrated_at = str(datetime.datetime.now())
+        try:
+            with open(self.legacy_data_file, "rb") as f:
+                for command_name, mapping in self._iter_legacy_entries(f):
+                    # 旧版条目只需 llm_function / description / created_at 三个字段
+                    if type(mapping) is not dict:
+                        continue
+                    llm_function = str(mapping.get("llm_function", "")).strip()
+                    if not llm_function:
+                        continue
+                    migrated[str(command_name).strip()] = {
+                        "llm_function": llm_function,
+                        "description": str(mapping.get("description", "")).strip(),
+                        "arg_description": "",
+                        "enabled": True,
+                        "group": "legacy",
+                        "aliases": [],
+                        "created_at": str(mapping.get("created_at", "")).strip()
+                        or migrated_at,
+                    }
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.error("读取旧版指令映射失败: %s", e)
+            return {}
         return migrated
 
     def _migrate_legacy_data_if_needed(self):
-        compat_config = self._get_section("compat_config", {})
+        compat_config = self._compat_config
         auto_migrate = bool(compat_config.get("auto_migrate_legacy_json", True))
         already_migrated = bool(compat_config.get("migration_once_flag", False))
         keep_backup = bool(compat_config.get("keep_legacy_backup", True))
@@ -217,84 +339,91 @@ class DataManager:
 
         if self.command_mappings:
             compat_config["migration_once_flag"] = True
-            self.config["compat_config"] = compat_config
             self._save_config()
             return
 
         legacy_mappings = self._load_legacy_mappings()
         if not legacy_mappings:
             compat_config["migration_once_flag"] = True
-            self.config["compat_config"] = compat_config
             self._save_config()
             return
 
+        # 迁移结果与迁移标记合并为一次写盘，写盘成功后再备份旧文件
         self.command_mappings = legacy_mappings
+        self._rebuild_indexes()
+        compat_config["migration_once_flag"] = True
         self._save_mappings_to_config()
         logger.info(
-            f"已从旧版 JSON 自动迁移 {len(legacy_mappings)} 条指令映射到插件配置"
+            "已从旧版 JSON 自动迁移 %d 条指令映射到插件配置", len(legacy_mappings)
         )
 
-        if keep_backup and os.path.exists(self.legacy_data_file):
+        if keep_backup:
+            # 同一目录内重命名，os.replace 本身即为原子操作，无需复制文件内容
             backup_path = self.legacy_data_file.with_suffix(".json.bak")
             try:
                 os.replace(self.legacy_data_file, backup_path)
-                logger.info(f"旧版映射文件已备份到: {backup_path}")
+                logger.info("旧版映射文件已备份到: %s", backup_path)
+            except FileNotFoundError:
+                pass
             except Exception as e:
-                logger.error(f"备份旧版映射文件失败: {e}")
-
-        compat_config["migration_once_flag"] = True
-        self.config["compat_config"] = compat_config
-        self._save_config()
+                logger.error("备份旧版映射文件失败: %s", e)
 
     def is_plugin_enabled(self) -> bool:
-        basic_config = self._get_section("basic_config", {})
-        return bool(basic_config.get("enable_plugin", True))
+        return bool(self._basic_config.get("enable_plugin", True))
 
     def should_auto_refresh_on_change(self) -> bool:
-        basic_config = self._get_section("basic_config", {})
-        return bool(basic_config.get("auto_refresh_on_change", True))
+        return bool(self._basic_config.get("auto_refresh_on_change", True))
 
     def strict_validation_enabled(self) -> bool:
-        basic_config = self._get_section("basic_config", {})
-        return bool(basic_config.get("strict_validation", False))
+        return bool(self._basic_config.get("strict_validation", False))
 
     def allow_duplicate_llm_function(self) -> bool:
-        mapping_config = self._get_section("mapping_config", {})
-        return bool(mapping_config.get("allow_duplicate_llm_function", True))
+        return bool(self._mapping_config.get("allow_duplicate_llm_function", True))
 
     def get_capture_timeout(self) -> float:
-        execution_config = self._get_section("execution_config", {})
         try:
-            return max(float(execution_config.get("capture_timeout_sec", 20)), 1.0)
+            return max(
+                float(self._execution_config.get("capture_timeout_sec", 20)), 1.0
+            )
         except Exception:
             return 20.0
 
     def get_forward_interval(self) -> float:
-        execution_config = self._get_section("execution_config", {})
         try:
-            return max(float(execution_config.get("forward_interval_sec", 0.5)), 0.0)
+            return max(
+                float(self._execution_config.get("forward_interval_sec", 0.5)), 0.0
+            )
         except Exception:
             return 0.5
 
     def get_response_mode(self) -> str:
-        execution_config = self._get_section("execution_config", {})
-        mode = str(execution_config.get("response_mode", "forward_only"))
-        if mode not in {"forward_and_text", "text_only", "forward_only"}:
-            return "forward_only"
-        return mode
+        mode = self._execution_config.get("response_mode", "forward_only")
+        if type(mode) is str and mode in _VALID_RESPONSE_MODES:
+            return mode
+        return "forward_only"
+
+    def get_runtime_config(self) -> RuntimeConfig:
+        """一次性获取执行参数，结果缓存到下次重新加载或映射变更"""
+        if self._runtime_config is None:
+            capture_timeout = self.get_capture_timeout()
+            self._runtime_config = RuntimeConfig(
+                capture_timeout=capture_timeout,
+                wait_interval=min(0.5, max(0.05, capture_timeout / 200)),
+                forward_interval=self.get_forward_interval(),
+                response_mode=self.get_response_mode(),
+            )
+        return self._runtime_config
 
     def get_tool_description(self) -> str:
-        tool_config = self._get_section("tool_config", {})
         return str(
-            tool_config.get(
+            self._tool_config.get(
                 "tool_description", "将已有指令映射为可调用函数，让 AI 能触发插件命令。"
             )
         ).strip()
 
     def get_default_arg_description(self) -> str:
-        tool_config = self._get_section("tool_config", {})
         return str(
-            tool_config.get(
+            self._tool_config.get(
                 "arg_description",
                 "指令参数字符串。推荐 key=value 格式，多参数用空格分隔。例如：text=喝水 time=10:00。",
             )
@@ -308,15 +437,17 @@ class DataManager:
         Returns:
             (success, message): 成功状态和消息
         """
-        self.reload_from_config()
         logger.info(
-            f"[data_manager] add_mapping 被调用 - 指令: '{command_name}', 函数: '{llm_function}', 描述: '{description}'"
+            "[data_manager] add_mapping 被调用 - 指令: '%s', 函数: '%s', 描述: '%s'",
+            command_name,
+            llm_function,
+            description,
         )
 
         # 验证参数
         errors = CommandUtils.validate_mapping(command_name, llm_function)
         if errors:
-            logger.warning(f"[data_manager] 参数验证失败: {errors}")
+            logger.warning("[data_manager] 参数验证失败: %s", errors)
             return False, f"参数验证失败: {'; '.join(errors)}"
 
         if self.strict_validation_enabled():
@@ -324,21 +455,21 @@ class DataManager:
                 return False, "LLM函数名称仅允许字母、数字和下划线"
 
         if not self.allow_duplicate_llm_function():
-            for existed_command, mapping in self.command_mappings.items():
-                if existed_command == command_name:
-                    continue
-                if mapping.get("llm_function") == llm_function:
-                    return (
-                        False,
-                        f"LLM函数 '{llm_function}' 已被指令 '{existed_command}' 使用",
-                    )
+            existed_command = self._llm_function_index.get(llm_function)
+            if existed_command and existed_command != command_name:
+                return (
+                    False,
+                    f"LLM函数 '{llm_function}' 已被指令 '{existed_command}' 使用",
+                )
 
         if command_name in self.command_mappings:
-            logger.warning(f"[data_manager] 指令已存在: {command_name}")
+            logger.warning("[data_manager] 指令已存在: %s", command_name)
             return False, f"指令 '{command_name}' 已存在映射"
 
-        logger.info(f"[data_manager] 开始添加映射")
-        self.command_mappings[command_name] = {
+        logger.info("[data_manager] 开始添加映射")
+        command_name = sys.intern(command_name)
+        llm_function = sys.intern(llm_function)
+        mapping = {
             "llm_function": llm_function,
             "description": description,
             "enabled": True,
@@ -346,25 +477,43 @@ class DataManager:
             "aliases": [],
             "created_at": str(datetime.datetime.now()),
         }
+        self.command_mappings[command_name] = mapping
+        self._serialized_index[command_name] = len(self._serialized)
+        self._serialized.append(self._serialize_mapping(command_name, mapping))
+        self._llm_function_index.setdefault(llm_function, command_name)
+        self._enabled_commands[command_name] = None
 
-        logger.info(f"[data_manager] 保存映射配置")
+        logger.info("[data_manager] 保存映射配置")
         self._save_mappings_to_config()
-        logger.info(f"[data_manager] 映射添加完成")
+        logger.info("[data_manager] 映射添加完成")
         return True, f"成功添加指令映射：'{command_name}' -> '{llm_function}'"
 
     def remove_mapping(self, command_name: str) -> bool:
         """删除指令映射"""
-        self.reload_from_config()
         if command_name not in self.command_mappings:
             return False
 
-        del self.command_mappings[command_name]
+        llm_function = self.command_mappings.pop(command_name)["llm_function"]
+        self._enabled_commands.pop(command_name, None)
+        self._disabled_commands.pop(command_name, None)
+        if self._llm_function_index.get(llm_function) == command_name:
+            # 该函数名可能仍被其他指令复用，改由剩余的首个指令占用
+            del self._llm_function_index[llm_function]
+            for other_command, mapping in self.command_mappings.items():
+                if mapping["llm_function"] == llm_function:
+                    self._llm_function_index[llm_function] = other_command
+                    break
+
+        # 按位置删除以保持配置中的映射顺序，仅需修正其后条目的索引
+        index = self._serialized_index.pop(command_name)
+        del self._serialized[index]
+        for entry in self._serialized[index:]:
+            self._serialized_index[entry["command_name"]] -= 1
         self._save_mappings_to_config()
         return True
 
     def set_mapping_enabled(self, command_name: str, enabled: bool) -> Tuple[bool, str]:
         """启用/禁用映射"""
-        self.reload_from_config()
         mapping = self.command_mappings.get(command_name)
         if not mapping:
             return False, f"错误：指令 '{command_name}' 不存在映射"
@@ -375,46 +524,66 @@ class DataManager:
             return False, f"指令 '{command_name}' 已是{state_text}状态"
 
         mapping["enabled"] = enabled
-        self.command_mappings[command_name] = mapping
+        # 直接追加会把指令排到末尾，按配置顺序重建以保持 ls 与工具注册顺序
+        self._rebuild_state_indexes()
+        self._serialized[self._serialized_index[command_name]]["enabled"] = enabled
         self._save_mappings_to_config()
 
         state_text = "启用" if enabled else "禁用"
         return True, f"已{state_text}指令映射：'{command_name}'"
 
-    def get_mapping(self, command_name: str, enabled_only: bool = True) -> Dict:
-        """获取指令映射"""
-        self.reload_from_config()
-        mapping = self.command_mappings.get(command_name, {})
-        if enabled_only and mapping and not mapping.get("enabled", True):
-            return {}
-        return mapping.copy() if mapping else {}
+    def get_mapping_view(
+        self, command_name: str, enabled_only: bool = True
+    ) -> Mapping[str, Any]:
+        """获取指令映射（只读引用，调用方不得修改返回值）"""
+        mapping = self.command_mappings.get(command_name)
+        if not mapping or (enabled_only and not mapping["enabled"]):
+            return _EMPTY_MAPPING
+        return mapping
+
+    def get_mapping_copy(
+        self, command_name: str, enabled_only: bool = True
+    ) -> Dict[str, Any]:
+        """获取指令映射的副本，供需要修改返回值的调用方使用"""
+        return dict(self.get_mapping_view(command_name, enabled_only))
+
+    # 兼容旧接口：返回副本
+    get_mapping = get_mapping_copy
+
+    def iter_enabled_mappings(self) -> Iterator[Tuple[str, Mapping[str, Any]]]:
+        """按配置顺序逐个产出已启用的 (command_name, mapping)，不构造中间字典
+
+        顺序由 _enabled_commands 保证：启用/禁用切换后会按配置顺序重建该索引。
+        """
+        mappings = self.command_mappings
+        for command_name in self._enabled_commands:
+            yield command_name, mappings[command_name]
 
     def list_mappings(
         self, enabled_only: bool = False, state_filter: str = "all"
-    ) -> Dict[str, Dict]:
-        """列出指令映射
+    ) -> Mapping[str, Dict]:
+        """列出指令映射（返回值及其中的映射均为只读，调用方不得修改）
 
         Args:
             enabled_only: 兼容旧参数，等价于 state_filter="enabled"
             state_filter: all/enabled/disabled
         """
-        self.reload_from_config()
         mode = state_filter.lower().strip()
         if enabled_only and mode == "all":
             mode = "enabled"
 
         if mode == "all":
-            return self.command_mappings.copy()
+            return self._mappings_view
         if mode == "enabled":
+            mappings = self.command_mappings
             return {
-                command_name: mapping
-                for command_name, mapping in self.command_mappings.items()
-                if mapping.get("enabled", True)
+                command_name: mappings[command_name]
+                for command_name in self._enabled_commands
             }
         if mode == "disabled":
+            mappings = self.command_mappings
             return {
-                command_name: mapping
-                for command_name, mapping in self.command_mappings.items()
-                if not mapping.get("enabled", True)
+                command_name: mappings[command_name]
+                for command_name in self._disabled_commands
             }
-        return self.command_mappings.copy()
+        return self._mappings_view
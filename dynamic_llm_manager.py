@@ -1,10 +1,23 @@
 import asyncio
-from typing import Dict, List, Optional
+import logging
+import sys
+from typing import Any, Dict, List, Mapping, Optional
 from astrbot.api import logger
 from astrbot.api.star import Context
 from .data_manager import DataManager
 from .command_processor import CommandProcessor
 
+# 指令名转函数名时需替换的字符
+_NAME_TRANS = str.maketrans({" ": "_", "-": "_"})
+
+# 动态处理函数的文档字符串模板
+_DOCSTRING_TEMPLATE = """执行指令 %s
+
+        Args:
+            command_text(string): 要执行的指令，固定值为 '%s'
+            args(string): 指令参数，可选
+        """
+
 
 class DynamicLLMManager:
     """动态LLM函数管理器，用于动态注册和管理LLM函数"""
@@ -27,36 +40,52 @@ class DynamicLLMManager:
                 logger.info("插件处于禁用状态，跳过动态LLM函数注册")
                 return
 
-            mappings = self.data_manager.list_mappings(enabled_only=True)
-            for command_name, mapping in mappings.items():
+            # 全局描述在本轮注册中保持不变，只读取一次
+            default_arg_desc = self.data_manager.get_default_arg_description()
+            global_tool_desc = self.data_manager.get_tool_description()
+
+            # 注册过程中不会修改映射，可直接遍历启用索引
+            for command_name, mapping in self.data_manager.iter_enabled_mappings():
                 llm_function = mapping.get("llm_function")
                 description = mapping.get("description", "")
 
                 if llm_function and llm_function not in self.registered_functions:
                     self._register_single_function(
-                        command_name, llm_function, description
+                        command_name,
+                        llm_function,
+                        description,
+                        mapping,
+                        default_arg_desc,
+                        global_tool_desc,
                     )
                     self.registered_functions.add(llm_function)
-                    logger.info(f"动态注册LLM函数: {llm_function} -> {command_name}")
+                    logger.info("动态注册LLM函数: %s -> %s", llm_function, command_name)
 
         except Exception as e:
-            logger.error(f"注册动态LLM函数失败: {e}")
+            logger.error("注册动态LLM函数失败: %s", e)
 
     def _register_single_function(
-        self, command_name: str, llm_function: str, description: str
+        self,
+        command_name: str,
+        llm_function: str,
+        description: str,
+        mapping: Mapping[str, Any],
+        default_arg_desc: str,
+        global_tool_desc: str,
     ):
-        """注册单个LLM函数"""
+        """注册单个LLM函数
+
+        mapping 为调用方已取得的指令映射；两个全局描述由调用方在批量注册前读取一次。
+        """
         logger.info(
-            f"[dynamic_llm_manager] 注册单个LLM函数: {llm_function} -> {command_name}"
+            "[dynamic_llm_manager] 注册单个LLM函数: %s -> %s",
+            llm_function,
+            command_name,
         )
 
         try:
             # 创建函数参数定义
-            mapping = self.data_manager.get_mapping(command_name, enabled_only=False)
-            specific_arg_desc = (
-                str(mapping.get("arg_description", "")).strip() if mapping else ""
-            )
-            default_arg_desc = self.data_manager.get_default_arg_description()
+            specific_arg_desc = str(mapping.get("arg_description", "")).strip()
             arg_description = specific_arg_desc or default_arg_desc
 
             func_args = [
@@ -73,42 +102,52 @@ class DynamicLLMManager:
             ]
 
             # 创建函数描述
-            global_tool_desc = self.data_manager.get_tool_description()
             func_desc = f"执行指令 '{command_name}'"
             if description:
                 func_desc += f"，{description}"
             if global_tool_desc:
                 func_desc += f"。{global_tool_desc}"
 
-            logger.info(f"[dynamic_llm_manager] 创建函数参数: {func_args}")
-            logger.info(f"[dynamic_llm_manager] 函数描述: {func_desc}")
+            logger.info("[dynamic_llm_manager] 创建函数参数: %s", func_args)
+            logger.info("[dynamic_llm_manager] 函数描述: %s", func_desc)
 
             # 创建动态处理器
             handler = self._create_dynamic_handler(command_name)
-            logger.info(f"[dynamic_llm_manager] 动态处理器创建完成: {handler}")
+            logger.info("[dynamic_llm_manager] 动态处理器创建完成: %s", handler)
 
             # 注册到LLM工具管理器
-            logger.info(f"[dynamic_llm_manager] 开始注册到LLM工具管理器")
+            logger.info("[dynamic_llm_manager] 开始注册到LLM工具管理器")
             # 直接使用 add_func 方法，绕过 context.register_llm_tool 的bug
             self.context.provider_manager.llm_tools.add_func(
                 llm_function, func_args, func_desc, handler
             )
-            logger.info(f"[dynamic_llm_manager] LLM函数注册完成: {llm_function}")
+            logger.info("[dynamic_llm_manager] LLM函数注册完成: %s", llm_function)
 
         except Exception as e:
-            logger.error(f"[dynamic_llm_manager] 注册LLM函数 {llm_function} 失败: {e}")
-            import traceback
-
-            logger.error(f"[dynamic_llm_manager] 错误堆栈:\n{traceback.format_exc()}")
+            logger.exception(
+                "[dynamic_llm_manager] 注册LLM函数 %s 失败: %s", llm_function, e
+            )
 
     def _create_dynamic_handler(self, command_name: str):
         """创建动态处理函数"""
-        logger.info(f"[dynamic_llm_manager] 创建动态处理函数: {command_name}")
+        # 驻留指令名，闭包内的比较与字典查找可走指针相等的快速路径
+        command_name = sys.intern(command_name)
+        logger.info("[dynamic_llm_manager] 创建动态处理函数: %s", command_name)
+
+        # 每次 LLM 调用都会用到的属性与日志方法，在创建时绑定到闭包
+        execute = self.command_processor.execute_command
+        get_response_mode = self.data_manager.get_response_mode
+        log_info = logger.info
+        log_exception = logger.exception
+        log_enabled = logger.isEnabledFor(logging.INFO)
 
         async def dynamic_handler(event, **kwargs):
-            logger.info(
-                f"[dynamic_llm_manager] 动态函数 {command_name} 被调用，参数: {kwargs}"
-            )
+            if log_enabled:
+                log_info(
+                    "[dynamic_llm_manager] 动态函数 %s 被调用，参数: %s",
+                    command_name,
+                    kwargs,
+                )
 
             # 获取参数
             command_text = kwargs.get("command_text", command_name)
@@ -118,19 +157,22 @@ class DynamicLLMManager:
             if command_text != command_name:
                 command_text = command_name
 
-            logger.info(
-                f"[dynamic_llm_manager] 执行指令: '{command_text}', 参数: '{args}'"
-            )
+            if log_enabled:
+                log_info(
+                    "[dynamic_llm_manager] 执行指令: '%s', 参数: '%s'",
+                    command_text,
+                    args,
+                )
 
             try:
-                result = await self.command_processor.execute_command(
-                    event, command_text, args
-                )
-                logger.info(
-                    f"[dynamic_llm_manager] 指令执行完成，结果长度: {len(str(result))}"
-                )
+                result = await execute(event, command_text, args)
+                if log_enabled:
+                    log_info(
+                        "[dynamic_llm_manager] 指令执行完成，结果长度: %d",
+                        len(str(result)),
+                    )
 
-                response_mode = self.data_manager.get_response_mode()
+                response_mode = get_response_mode()
                 if response_mode == "forward_only":
                     # 对齐 astrbot_plugin_opencode：工具自行发送结果，避免触发额外 LLM 复述
                     return
@@ -139,26 +181,15 @@ class DynamicLLMManager:
                 return f"指令执行结果：{result}"
 
             except Exception as e:
-                logger.error(f"[dynamic_llm_manager] 动态函数执行失败: {e}")
-                import traceback
-
-                logger.error(
-                    f"[dynamic_llm_manager] 错误堆栈:\n{traceback.format_exc()}"
-                )
+                log_exception("[dynamic_llm_manager] 动态函数执行失败: %s", e)
                 raise
 
         # 设置函数名和文档字符串
-        safe_name = command_name.replace(" ", "_").replace("-", "_")
-        dynamic_handler.__name__ = f"dynamic_{safe_name}"
-        dynamic_handler.__doc__ = f"""执行指令 {command_name}
-        
-        Args:
-            command_text(string): 要执行的指令，固定值为 '{command_name}'
-            args(string): 指令参数，可选
-        """
+        dynamic_handler.__name__ = "dynamic_" + command_name.translate(_NAME_TRANS)
+        dynamic_handler.__doc__ = _DOCSTRING_TEMPLATE % (command_name, command_name)
 
         logger.info(
-            f"[dynamic_llm_manager] 动态处理函数创建完成: {dynamic_handler.__name__}"
+            "[dynamic_llm_manager] 动态处理函数创建完成: %s", dynamic_handler.__name__
         )
         return dynamic_handler
 
@@ -168,35 +199,34 @@ class DynamicLLMManager:
             if llm_function in self.registered_functions:
                 self.context.unregister_llm_tool(llm_function)
                 self.registered_functions.remove(llm_function)
-                logger.info(f"注销LLM函数: {llm_function}")
+                logger.info("注销LLM函数: %s", llm_function)
         except Exception as e:
-            logger.error(f"注销LLM函数 {llm_function} 失败: {e}")
+            logger.error("注销LLM函数 %s 失败: %s", llm_function, e)
 
     def refresh_functions(self):
         """刷新所有动态函数"""
-        logger.info(f"[dynamic_llm_manager] 开始刷新动态LLM函数")
+        logger.info("[dynamic_llm_manager] 开始刷新动态LLM函数")
 
         try:
             # 注销所有已注册的函数
             logger.info(
-                f"[dynamic_llm_manager] 注销已注册的 {len(self.registered_functions)} 个函数"
+                "[dynamic_llm_manager] 注销已注册的 %d 个函数",
+                len(self.registered_functions),
             )
             for func_name in list(self.registered_functions):
                 self.unregister_function(func_name)
 
             # 重新注册所有函数
-            logger.info(f"[dynamic_llm_manager] 重新注册所有函数")
+            logger.info("[dynamic_llm_manager] 重新注册所有函数")
             self.register_dynamic_functions()
 
             logger.info(
-                f"[dynamic_llm_manager] 刷新动态LLM函数完成，当前注册了 {len(self.registered_functions)} 个函数"
+                "[dynamic_llm_manager] 刷新动态LLM函数完成，当前注册了 %d 个函数",
+                len(self.registered_functions),
             )
 
         except Exception as e:
-            logger.error(f"[dynamic_llm_manager] 刷新动态LLM函数失败: {e}")
-            import traceback
-
-            logger.error(f"[dynamic_llm_manager] 错误堆栈:\n{traceback.format_exc()}")
+            logger.exception("[dynamic_llm_manager] 刷新动态LLM函数失败: %s", e)
 
     def get_registered_functions(self) -> List[str]:
         """获取已注册的函数列表"""
@@ -1,3 +1,4 @@
+from functools import lru_cache
 from astrbot.api.event import filter, AstrMessageEvent, MessageEventResult
 from astrbot.api.star import Context, Star, register
 from astrbot.api.message_components import *
@@ -8,6 +9,12 @@ from .data_manager import DataManager
 from .dynamic_llm_manager import DynamicLLMManager
 
 
+@lru_cache(maxsize=512)
+def _normalize_command_str(command_str: str) -> str:
+    """将指令参数中的 "--" 还原为空格（结果缓存，LLM 反复调用同一指令时直接命中）"""
+    return command_str.replace("--", " ")
+
+
 @register("command_to_llm", "kjqwdw", "将指令转换为LLM函数调用", "1.1.0")
 class CommandToLLM(Star):
     def __init__(self, context: Context, config: AstrBotConfig = None):
@@ -58,7 +65,7 @@ class CommandToLLM(Star):
         )
 
         # 解析指令名（将 -- 替换为空格）
-        command_name = command_str.replace("--", " ")
+        command_name = _normalize_command_str(command_str)
 
         logger.info(
             f"[command_to_llm] 解析结果 - 指令名: '{command_name}', LLM函数: '{llm_function}', 描述: '{description}'"
@@ -70,10 +77,7 @@ class CommandToLLM(Star):
             ):
                 yield result
         except Exception as e:
-            logger.error(f"[command_to_llm] add_mapping 调用失败: {e}")
-            import traceback
-
-            logger.error(f"[command_to_llm] 错误堆栈:\n{traceback.format_exc()}")
+            logger.exception("[command_to_llm] add_mapping 调用失败: %s", e)
             yield event.plain_result(f"添加映射时发生错误：{str(e)}")
 
     @cmd2llm.command("ls")
@@ -94,7 +98,7 @@ class CommandToLLM(Star):
             command_str: 指令名称（支持 -- 连接）
         """
         # 解析指令名（将 -- 替换为空格）
-        command_name = command_str.replace("--", " ")
+        command_name = _normalize_command_str(command_str)
         async for result in self.command_processor.remove_mapping(event, command_name):
             yield result
 
@@ -105,7 +109,7 @@ class CommandToLLM(Star):
         格式：/cmd2llm enable <指令名>
         示例：/cmd2llm enable rmd--ls
         """
-        command_name = command_str.replace("--", " ")
+        command_name = _normalize_command_str(command_str)
         async for result in self.command_processor.set_mapping_enabled(
             event, command_name, True
         ):
@@ -118,7 +122,7 @@ class CommandToLLM(Star):
         格式：/cmd2llm disable <指令名>
         示例：/cmd2llm disable rmd--ls
         """
-        command_name = command_str.replace("--", " ")
+        command_name = _normalize_command_str(command_str)
         async for result in self.command_processor.set_mapping_enabled(
             event, command_name, False
         ):
@@ -134,7 +138,7 @@ class CommandToLLM(Star):
         示例：/cmd2llm exec rmd--ls
         """
         # 解析指令名（将 -- 替换为空格）
-        command_text = command_str.replace("--", " ")
+        command_text = _normalize_command_str(command_str)
 
         async for result in self.command_processor.execute_command(
             event, command_text, args
@@ -152,7 +156,7 @@ class CommandToLLM(Star):
 /cmd2llm enable <指令名> - 启用指令映射
 /cmd2llm disable <指令名> - 禁用指令映射
 /cmd2llm exec <指令名> [参数] - 执行指令
-/cmd2llm refresh - 刷新动态LLM函数
+/cmd2llm refresh - 重新加载配置并刷新动态LLM函数
 /cmd2llm help - 显示此帮助
 
 指令名格式：
@@ -176,8 +180,10 @@ class CommandToLLM(Star):
 
     @cmd2llm.command("refresh")
     async def refresh_functions(self, event: AstrMessageEvent):
-        """刷新动态LLM函数"""
+        """重新加载配置并刷新动态LLM函数"""
         try:
+            self.data_manager.reload_from_config()
+            self.command_processor.invalidate_wake_prefix_cache()
             self.dynamic_llm_manager.refresh_functions()
             registered_count = len(self.dynamic_llm_manager.get_registered_functions())
             yield event.plain_result(